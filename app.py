@@ -13,17 +13,37 @@ USER POV workflow:
 Do NOT store folium.Map in session_state. Store only lightweight route/graph data.
 """
 
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import streamlit as st
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
 import osmnx as ox
 import networkx as nx
+import numpy as np
 
 # Project modules
-from network_builder import build_network_pipeline, find_candidate_routes
+from network_builder import (
+    build_network_pipeline,
+    find_candidate_routes,
+    load_or_build_pipeline,
+)
 from traffic_simulator import build_traffic_scenario
 from qubo_builder import build_priority_aware_qubo
 from solver import solve_traffic_qubo
-from visualization import visualize_traffic_map
+from visualization import (
+    EARTH_RADIUS_M,
+    build_node_coords,
+    build_traffic_layers,
+    get_graph_center,
+    get_node_coords,
+    route_length_m,
+    visualize_traffic_map,
+)
 
 # Initialize session_state keys we will persist (lightweight data only)
 for key in (
@@ -32,12 +52,224 @@ for key in (
     "traffic_routes",
     "regular_routes",
     "emergency_routes",
+    "traffic_layers",
     "original_route",
     "optimized_route",
+    "solve_job",
+    "route_locked",
 ):
     if key not in st.session_state:
         st.session_state[key] = None
 
+# --------------------------------------------------
+# CACHED BUILDERS
+# --------------------------------------------------
+# Streamlit re-executes this whole script on every widget interaction, so the
+# expensive network download / scenario construction and geocoder lookups are
+# memoized across reruns, keyed by their (hashable) arguments.
+
+@st.cache_resource(show_spinner=False)
+def _cached_network(place, num_vehicles):
+    """Build (or reuse, in memory or from disk) the road network pipeline for a place."""
+    return load_or_build_pipeline(place_name=place, num_vehicles=num_vehicles)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_scenario(place, num_vehicles, emergency_ratio):
+    """Build (or reuse) the traffic scenario on top of the cached network."""
+    network_data = _cached_network(place, num_vehicles)
+    return build_traffic_scenario(network_data, emergency_ratio=emergency_ratio)
+
+
+def _fresh_scenario(place, num_vehicles, emergency_ratio):
+    """Build a new traffic scenario with freshly sampled OD pairs and congestion.
+
+    Bypasses the in-memory caches and the on-disk pipeline file; only the
+    downloaded road graph itself is reused.
+    """
+    network_data = build_network_pipeline(place_name=place, num_vehicles=num_vehicles)
+    return build_traffic_scenario(network_data, emergency_ratio=emergency_ratio)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _geocode(query):
+    """Geocode a free-text query to (lat, lon), reusing recent answers."""
+    return ox.geocode(query)
+
+
+def _project_xy(lats, lons, cos_lat0):
+    """Project (lat, lon) degrees onto a local equirectangular plane in meters."""
+    return np.column_stack((
+        EARTH_RADIUS_M * np.radians(lons) * cos_lat0,
+        EARTH_RADIUS_M * np.radians(lats),
+    ))
+
+
+def _node_tree(G):
+    """Return a planar KD-tree over projected graph nodes, built once and kept on ``G.graph``.
+
+    Projecting around the graph's mean latitude is accurate at city scale and
+    lets the tree use plain Euclidean distance instead of haversine. Storing it
+    on the graph ties its lifetime to the graph rather than to a recyclable id.
+    """
+    cache = G.graph.get("_node_tree")
+    if cache is None:
+        from scipy.spatial import cKDTree
+
+        # Full precision for snapping; the cached float32 coords are for rendering
+        coords, node_idx = build_node_coords(G, dtype=np.float64)
+        cos_lat0 = float(np.cos(np.radians(coords[:, 0].mean())))
+        tree = cKDTree(_project_xy(coords[:, 0], coords[:, 1], cos_lat0))
+        cache = (tree, list(node_idx), cos_lat0)
+        G.graph["_node_tree"] = cache
+    return cache
+
+
+def _snap_to_nodes(G, lats, lons):
+    """Snap a batch of (lat, lon) points to their nearest graph nodes."""
+    tree, node_list, cos_lat0 = _node_tree(G)
+    _, idx = tree.query(_project_xy(np.asarray(lats), np.asarray(lons), cos_lat0), k=1)
+    return [node_list[i] for i in idx]
+
+
+def _routing_csr(G):
+    """Return a CSR adjacency of edge lengths, built once and kept on ``G.graph``."""
+    cache = G.graph.get("_routing_csr")
+    if cache is None:
+        from scipy.sparse import csr_matrix
+
+        node_list = list(G.nodes)
+        node_idx = {n: i for i, n in enumerate(node_list)}
+        # Keep the shortest of any parallel edges; the CSR constructor would sum them
+        best = {}
+        for u, v, length in G.edges(data="length", default=1.0):
+            key = (node_idx[u], node_idx[v])
+            if length < best.get(key, float("inf")):
+                best[key] = length
+        rows, cols = zip(*best) if best else ((), ())
+        n = len(node_list)
+        csr = csr_matrix((list(best.values()), (rows, cols)), shape=(n, n))
+        cache = (csr, node_list, node_idx)
+        G.graph["_routing_csr"] = cache
+    return cache
+
+
+def _shortest_route(G, source, target):
+    """Length-weighted shortest path between two nodes via scipy's Dijkstra."""
+    from scipy.sparse.csgraph import dijkstra
+
+    csr, node_list, node_idx = _routing_csr(G)
+    src, dst = node_idx[source], node_idx[target]
+    _, predecessors = dijkstra(
+        csr, directed=G.is_directed(), indices=src, return_predecessors=True
+    )
+    if src != dst and predecessors[dst] < 0:
+        raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+
+    path_idx = [dst]
+    while path_idx[-1] != src:
+        path_idx.append(predecessors[path_idx[-1]])
+    return [node_list[i] for i in reversed(path_idx)]
+
+
+def _graph_token(G):
+    """Per-graph cache key kept on ``G.graph``; unlike id(G), never reused by another graph."""
+    return G.graph.setdefault("_token", uuid.uuid4().hex)
+
+
+# Each entry is a full page of HTML with every traffic feature inlined
+@st.cache_data(max_entries=16, show_spinner=False)
+def _build_map_html(_G, graph_token, regular_routes, emergency_routes,
+                    original_route, optimized_route, user_start, user_end,
+                    _traffic_layers=None):
+    """Render the traffic map to HTML, re-rendering only when its inputs change.
+
+    `_G` and `_traffic_layers` are excluded from hashing; `graph_token` and the
+    route tuples stand in for them in the cache key.
+    """
+    m = visualize_traffic_map(
+        G=_G,
+        regular_routes=regular_routes,
+        emergency_routes=emergency_routes,
+        original_route=original_route,
+        optimized_route=optimized_route,
+        user_start=user_start,
+        user_end=user_end,
+        node_coords=get_node_coords(_G),
+        traffic_layers=_traffic_layers,
+    )
+    return m.get_root().render()
+
+
+# Spawned interpreters are heavy; a couple is plenty for click-driven solves
+SOLVER_MAX_WORKERS = min(2, os.cpu_count() or 1)
+
+
+@st.cache_resource(show_spinner=False)
+def _solver_pool():
+    """One process pool per server, so QUBO solves run off the script thread."""
+    return ProcessPoolExecutor(
+        max_workers=SOLVER_MAX_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _submit_solve(solve_args):
+    """Submit `solve_traffic_qubo(*solve_args)`, replacing the pool once if a dead worker broke it."""
+    pool = _solver_pool()
+    try:
+        return pool.submit(solve_traffic_qubo, *solve_args)
+    except BrokenProcessPool:
+        # Another session may already have replaced it; only drop this one
+        if _solver_pool() is pool:
+            _solver_pool.clear()
+        pool.shutdown(wait=False)
+        return _solver_pool().submit(solve_traffic_qubo, *solve_args)
+
+
+# --------------------------------------------------
+# SCENARIO STATE
+# --------------------------------------------------
+
+def _partition_routes(vehicles):
+    """Split each vehicle's first candidate route by vehicle type in one pass.
+
+    Returns:
+        (traffic_routes, regular_routes, emergency_routes)
+    """
+    traffic_routes = {}
+    regular_routes = []
+    emergency_routes = []
+    for v in vehicles:
+        chosen = (v.get("candidate_routes") or [[]])[0]
+        traffic_routes[v["vehicle_id"]] = chosen
+        (emergency_routes if v.get("type") == "emergency" else regular_routes).append(chosen)
+    return traffic_routes, regular_routes, emergency_routes
+
+
+def _store_scenario(scenario):
+    """Persist a traffic scenario's graph, vehicles and route partitions.
+
+    Routes and solves tied to the previous graph are dropped, since their
+    nodes may not exist in the new one; the user route is then recomputed.
+    """
+    vehicles = scenario["vehicles"]
+    traffic_routes, regular_routes, emergency_routes = _partition_routes(vehicles)
+
+    st.session_state["graph"] = scenario["graph"]
+    st.session_state["vehicles"] = vehicles
+    st.session_state["traffic_routes"] = traffic_routes
+    st.session_state["regular_routes"] = regular_routes
+    st.session_state["emergency_routes"] = emergency_routes
+    st.session_state["traffic_layers"] = build_traffic_layers(
+        scenario["graph"], regular_routes, emergency_routes
+    )
+    st.session_state["original_route"] = None
+    st.session_state["optimized_route"] = None
+    st.session_state["solve_job"] = None
+    st.session_state["_last_route_key"] = None
+
+
 # --------------------------------------------------
 # PAGE CONFIG
 # --------------------------------------------------
@@ -74,14 +306,13 @@ _time_map = {
     "Night": {"num_vehicles": 5, "emergency_ratio": 0.15},
 }
 
-# Show sliders for visibility but override their values from the preset
-_ = st.sidebar.slider("(Preset) Number of Vehicles", 3, 20, _time_map[time_of_day]["num_vehicles"], key="_num_vis")
-_ = st.sidebar.slider("(Preset) Emergency Vehicle Ratio", 0.0, 1.0, _time_map[time_of_day]["emergency_ratio"], step=0.05, key="_em_vis")
-
 # Use preset values
 num_vehicles = _time_map[time_of_day]["num_vehicles"]
 emergency_ratio = _time_map[time_of_day]["emergency_ratio"]
 
+# Display-only summary of the preset (no widget, so nothing to trigger reruns)
+st.sidebar.caption(f"Preset: {num_vehicles} vehicles, {emergency_ratio:.0%} emergency")
+
 solver_type = st.sidebar.selectbox(
     "Optimization Method",
     ["Simulated Annealing (Local)", "Quantum-Hybrid (D-Wave)"]
@@ -95,17 +326,24 @@ run_button = st.sidebar.button("Run Simulation")
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 📍 Your Journey")
 
-user_start_addr = st.sidebar.text_input(
-    "From", 
-    "Fort Kochi",
-    help="Enter your starting location"
-)
+# A form batches edits into a single rerun on submit instead of one per field change
+with st.sidebar.form("route_inputs"):
+    user_start_addr = st.text_input(
+        "From", 
+        "Fort Kochi",
+        help="Enter your starting location"
+    )
 
-user_end_addr = st.sidebar.text_input(
-    "To", 
-    "Ernakulam",
-    help="Enter your destination"
-)
+    user_end_addr = st.text_input(
+        "To", 
+        "Ernakulam",
+        help="Enter your destination"
+    )
+
+    route_submitted = st.form_submit_button("📍 Set Route")
+
+if route_submitted:
+    st.session_state["route_locked"] = True
 
 # Auto-geocode addresses to coordinates
 user_start_lat, user_start_lon = 0.0, 0.0
@@ -124,7 +362,7 @@ def smart_geocode(address, city, graph=None):
     
     for attempt in attempts:
         try:
-            location = ox.geocode(attempt)
+            location = _geocode(attempt)
             return location  # Returns (lat, lon)
         except:
             continue
@@ -132,18 +370,17 @@ def smart_geocode(address, city, graph=None):
     # Strategy 2: If we have a graph, use its center as fallback
     if graph is not None:
         try:
-            # Get graph bounding box center
-            nodes_gdf = ox.graph_to_gdfs(graph, nodes=True, edges=False)
-            center = nodes_gdf.unary_union.centroid
-            return (center.y, center.x)
+            return get_graph_center(graph)
         except:
             pass
     
     # Strategy 3: Default to Fort Kochi coordinates
     return (9.9674, 76.2425)  # Fort Kochi area
 
-# Only geocode if graph is loaded and addresses are provided
-if user_start_addr and user_end_addr and st.session_state.get("graph") is not None:
+# Only geocode once a route was submitted, the graph is loaded and addresses are provided
+route_requested = route_submitted or st.session_state.get("route_locked")
+if (route_requested and user_start_addr and user_end_addr
+        and st.session_state.get("graph") is not None):
     G = st.session_state.get("graph")
     
     # Geocode start
@@ -183,32 +420,9 @@ optimize_button = st.sidebar.button("🚀 Optimize My Route", type="primary")
 if st.session_state.get("graph") is None:
     with st.spinner("🌐 Loading road network..."):
         try:
-            network_data = build_network_pipeline(place_name=place, num_vehicles=num_vehicles)
-            scenario = build_traffic_scenario(network_data, emergency_ratio=emergency_ratio)
-
-            G = scenario["graph"]
-            vehicles = scenario["vehicles"]
-
-            traffic_routes = {}
-            regular_routes = []
-            emergency_routes = []
-
-            for v in vehicles:
-                vid = v["vehicle_id"]
-                candidates = v.get("candidate_routes", [])
-                chosen = candidates[0] if candidates else []
-                traffic_routes[vid] = chosen
-                if v.get("type") == "emergency":
-                    emergency_routes.append(chosen)
-                else:
-                    regular_routes.append(chosen)
-
-            st.session_state["graph"] = G
-            st.session_state["vehicles"] = vehicles
-            st.session_state["traffic_routes"] = traffic_routes
-            st.session_state["regular_routes"] = regular_routes
-            st.session_state["emergency_routes"] = emergency_routes
-            
+            scenario = _cached_scenario(place, num_vehicles, emergency_ratio)
+            _store_scenario(scenario)
+
         except Exception as e:
             st.error(f"❌ Failed to load network: {e}")
             st.info("💡 Try a different city or check internet connection")
@@ -221,32 +435,9 @@ if st.session_state.get("graph") is None:
 if run_button:
     with st.spinner("🔄 Rebuilding traffic scenario..."):
         try:
-            network_data = build_network_pipeline(place_name=place, num_vehicles=num_vehicles)
-            scenario = build_traffic_scenario(network_data, emergency_ratio=emergency_ratio)
-
-            G = scenario["graph"]
-            vehicles = scenario["vehicles"]
-
-            traffic_routes = {}
-            regular_routes = []
-            emergency_routes = []
-
-            for v in vehicles:
-                vid = v["vehicle_id"]
-                candidates = v.get("candidate_routes", [])
-                chosen = candidates[0] if candidates else []
-                traffic_routes[vid] = chosen
-                if v.get("type") == "emergency":
-                    emergency_routes.append(chosen)
-                else:
-                    regular_routes.append(chosen)
-
-            st.session_state["graph"] = G
-            st.session_state["vehicles"] = vehicles
-            st.session_state["traffic_routes"] = traffic_routes
-            st.session_state["regular_routes"] = regular_routes
-            st.session_state["emergency_routes"] = emergency_routes
-            
+            scenario = _fresh_scenario(place, num_vehicles, emergency_ratio)
+            _store_scenario(scenario)
+
             st.success("✅ Traffic scenario rebuilt!")
             
         except Exception as e:
@@ -261,20 +452,29 @@ has_user_coords = not (user_start_lat == 0.0 and user_start_lon == 0.0
 
 if has_user_coords and st.session_state.get("graph") is not None:
     G = st.session_state.get("graph")
-    try:
-        start_node = ox.nearest_nodes(G, user_start_lon, user_start_lat)
-        end_node = ox.nearest_nodes(G, user_end_lon, user_end_lat)
-        
+
+    # Snap + shortest path only when the coordinates changed; _store_scenario
+    # resets the key whenever it installs a new graph
+    route_key = (user_start_lat, user_start_lon, user_end_lat, user_end_lon)
+    if st.session_state.get("_last_route_key") != route_key:
+        st.session_state["_last_route_key"] = route_key
         try:
-            original_route = nx.shortest_path(G, start_node, end_node, weight="length")
-            st.session_state["original_route"] = original_route
-            st.sidebar.success(f"✓ Route found: {len(original_route)} waypoints")
+            start_node, end_node = _snap_to_nodes(
+                G, [user_start_lat, user_end_lat], [user_start_lon, user_end_lon]
+            )
+            
+            try:
+                original_route = _shortest_route(G, start_node, end_node)
+                st.session_state["original_route"] = original_route
+            except Exception as e:
+                st.sidebar.warning(f"⚠️ No path found: {e}")
+                st.session_state["original_route"] = None
         except Exception as e:
-            st.sidebar.warning(f"⚠️ No path found: {e}")
+            st.sidebar.warning(f"⚠️ Couldn't snap to road: {e}")
             st.session_state["original_route"] = None
-    except Exception as e:
-        st.sidebar.warning(f"⚠️ Couldn't snap to road: {e}")
-        st.session_state["original_route"] = None
+
+    if st.session_state.get("original_route"):
+        st.sidebar.success(f"✓ Route found: {len(st.session_state['original_route'])} waypoints")
 
 
 # --------------------------------------------------
@@ -283,9 +483,9 @@ if has_user_coords and st.session_state.get("graph") is not None:
 if optimize_button and st.session_state.get("graph") is not None:
     if st.session_state.get("original_route") is None:
         st.warning("⚠️ Please enter valid addresses first!")
-        st.info("💡 Make sure both 'From' and 'To' fields are filled and the map has loaded")
+        st.info("💡 Fill in both 'From' and 'To', click 'Set Route', and wait for the map to load")
     else:
-        with st.spinner("⚛️ Running quantum optimization..."):
+        with st.spinner("⚛️ Building optimization model..."):
             try:
                 G = st.session_state.get("graph")
                 vehicles = list(st.session_state.get("vehicles") or [])
@@ -312,26 +512,46 @@ if optimize_button and st.session_state.get("graph") is not None:
                 # Build QUBO
                 bqm, variable_map = build_priority_aware_qubo(vehicles)
 
-                # Solve
+                # Solve in the background; the result is collected on a later rerun
                 method = "sa" if "Simulated" in solver_type else "dwave"
-                selected_routes = solve_traffic_qubo(
-                    bqm=bqm,
-                    variable_map=variable_map,
-                    vehicles=vehicles,
-                    method=method,
-                )
-
-                optimized_route = selected_routes.get(user_vid)
-                if optimized_route:
-                    st.session_state["optimized_route"] = optimized_route
-                    st.success("✅ Route optimized successfully!")
-                else:
-                    st.warning("⚠️ Optimizer didn't find an alternative route")
-                    
+                solve_args = (bqm, variable_map, vehicles, method)
+                st.session_state["solve_job"] = (_submit_solve(solve_args), user_vid, solve_args)
+
             except Exception as e:
                 st.error(f"❌ Optimization failed: {e}")
 
 
+# --------------------------------------------------
+# COLLECT BACKGROUND SOLVE (if one is running)
+# --------------------------------------------------
+solve_pending = False
+if st.session_state.get("solve_job") is not None:
+    future, user_vid, solve_args = st.session_state["solve_job"]
+    if not future.done():
+        solve_pending = True
+        st.info("⚛️ Running quantum optimization in the background...")
+    else:
+        st.session_state["solve_job"] = None
+        try:
+            selected_routes = future.result()
+            optimized_route = selected_routes.get(user_vid)
+            if optimized_route:
+                st.session_state["optimized_route"] = optimized_route
+                st.success("✅ Route optimized successfully!")
+            else:
+                st.warning("⚠️ Optimizer didn't find an alternative route")
+        except BrokenProcessPool:
+            # A worker died mid-solve (OOM, kill): resubmit once on a fresh pool
+            if solve_args is not None:
+                st.session_state["solve_job"] = (_submit_solve(solve_args), user_vid, None)
+                solve_pending = True
+                st.info("⚛️ Solver restarted, retrying optimization...")
+            else:
+                st.error("❌ Optimization failed: solver process crashed")
+        except Exception as e:
+            st.error(f"❌ Optimization failed: {e}")
+
+
 # --------------------------------------------------
 # VISUALIZATION
 # --------------------------------------------------
@@ -342,31 +562,31 @@ if st.session_state.get("graph") is not None:
     original_route = st.session_state.get("original_route")
     optimized_route = st.session_state.get("optimized_route")
 
+    node_coords = get_node_coords(G)
+    coords, node_idx = node_coords
+
     # Get user markers
     if original_route and len(original_route) >= 1:
-        start_node = original_route[0]
-        end_node = original_route[-1]
-        user_start = (G.nodes[start_node]["y"], G.nodes[start_node]["x"])
-        user_end = (G.nodes[end_node]["y"], G.nodes[end_node]["x"])
+        user_start = tuple(coords[node_idx[original_route[0]]])
+        user_end = tuple(coords[node_idx[original_route[-1]]])
     elif optimized_route and len(optimized_route) >= 1:
-        start_node = optimized_route[0]
-        end_node = optimized_route[-1]
-        user_start = (G.nodes[start_node]["y"], G.nodes[start_node]["x"])
-        user_end = (G.nodes[end_node]["y"], G.nodes[end_node]["x"])
+        user_start = tuple(coords[node_idx[optimized_route[0]]])
+        user_end = tuple(coords[node_idx[optimized_route[-1]]])
     else:
-        first_node = next(iter(G.nodes))
-        user_start = (G.nodes[first_node]["y"], G.nodes[first_node]["x"])
+        user_start = tuple(coords[0])
         user_end = user_start
 
-    # Create map
-    m = visualize_traffic_map(
-        G=G,
-        regular_routes=regular_routes,
-        emergency_routes=emergency_routes,
-        original_route=original_route,
-        optimized_route=optimized_route,
-        user_start=user_start,
-        user_end=user_end,
+    # Create map (served from cache unless routes or markers changed)
+    map_html = _build_map_html(
+        G,
+        _graph_token(G),
+        tuple(tuple(r) for r in regular_routes),
+        tuple(tuple(r) for r in emergency_routes),
+        tuple(original_route) if original_route else None,
+        tuple(optimized_route) if optimized_route else None,
+        user_start,
+        user_end,
+        st.session_state.get("traffic_layers"),
     )
 
     # Display
@@ -379,23 +599,29 @@ if st.session_state.get("graph") is not None:
     col_leg3.markdown("🟥 **Your Original Route**")
     col_leg4.markdown("🟧 **Your Optimized Route**")
     
-    # Map
-    st_folium(m, width=1200, height=600)
+    # Map (st.iframe replaces the deprecated components.html on newer Streamlit)
+    if hasattr(st, "iframe"):
+        st.iframe(map_html, width=1200, height=600)
+    else:
+        components.html(map_html, width=1200, height=600)
     
     # Metrics (if user has route)
     if original_route or optimized_route:
         st.subheader("📊 Route Statistics")
         col1, col2, col3 = st.columns(3)
         
+        original_km = route_length_m(original_route, node_coords) / 1000.0 if original_route else 0.0
+
         with col1:
             if original_route:
-                st.metric("Original Route", f"{len(original_route)} nodes")
+                st.metric("Original Route", f"{original_km:.2f} km")
         
         with col2:
             if optimized_route:
-                improvement = len(original_route) - len(optimized_route) if original_route else 0
-                st.metric("Optimized Route", f"{len(optimized_route)} nodes", 
-                         delta=f"{improvement:+d} nodes")
+                optimized_km = route_length_m(optimized_route, node_coords) / 1000.0
+                improvement = original_km - optimized_km if original_route else 0.0
+                st.metric("Optimized Route", f"{optimized_km:.2f} km", 
+                         delta=f"{improvement:+.2f} km")
         
         with col3:
             emergency_count = len([v for v in st.session_state.get("vehicles", []) 
@@ -403,4 +629,12 @@ if st.session_state.get("graph") is not None:
             st.metric("Emergency Vehicles", emergency_count)
 
 else:
-    st.info("🌐 Loading network... Please wait")
\ No newline at end of file
+    st.info("🌐 Loading network... Please wait")
+
+
+# --------------------------------------------------
+# POLL BACKGROUND SOLVE (page stays interactive meanwhile)
+# --------------------------------------------------
+if solve_pending:
+    time.sleep(0.5)
+    st.rerun()
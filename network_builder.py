@@ -18,6 +18,7 @@ import osmnx as ox
 import networkx as nx
 import random
 import pickle
+import hashlib
 import os
 from pathlib import Path
 
@@ -29,6 +30,9 @@ from pathlib import Path
 CACHE_DIR = Path("cache")
 CACHE_DIR.mkdir(exist_ok=True)
 
+# Highest protocol on Python 3.8+; faster and more compact than the default
+PICKLE_PROTOCOL = 5
+
 
 # --------------------------------------------------
 # 1. BUILD ROAD NETWORK FROM OPENSTREETMAP (OPTIMIZED)
@@ -112,7 +116,7 @@ def build_road_network(place_name:  str, use_cache=True, network_size="medium"):
     if use_cache:
         try:
             with open(cache_file, 'wb') as f:
-                pickle.dump(G, f)
+                pickle.dump(G, f, protocol=PICKLE_PROTOCOL)
             print(f"💾 Network cached to {cache_file.name}")
         except Exception as e:
             print(f"⚠️ Caching failed: {e}")
@@ -128,6 +132,9 @@ def create_demo_network():
     """
     Create a simple grid network for demo purposes.
     Used when OSMnx download fails.
+
+    The graph is flagged with G.graph["demo"] = True so callers can
+    avoid persisting it in place of the real network.
     """
     print("   Creating 5x5 grid network for demonstration...")
     G = nx.grid_2d_graph(5, 5)
@@ -135,6 +142,7 @@ def create_demo_network():
     # Relabel nodes to integers
     mapping = {node: i for i, node in enumerate(G.nodes())}
     G = nx.relabel_nodes(G, mapping)
+    G.graph["demo"] = True
     
     # Add basic attributes
     for u, v in G.edges():
@@ -462,6 +470,58 @@ def build_network_pipeline(place_name, num_vehicles=5, use_cache=True,
     }
 
 
+# --------------------------------------------------
+# 8B. COMPLETE PIPELINE WITH DISK CACHE
+# --------------------------------------------------
+
+def load_or_build_pipeline(place_name, num_vehicles=5, use_cache=True,
+                           fast_mode=True, network_size="medium"):
+    """
+    Load a previously built pipeline from disk, or build and persist it.
+
+    The graph cache only skips the download; this also skips edge
+    attributes, OD sampling and candidate-route search, so a cold process
+    start is a single pickle load.
+
+    Args:
+        Same as build_network_pipeline.
+
+    Returns:
+        dict with graph, OD pairs, and routes
+    """
+    key = f"{place_name}|{num_vehicles}|{fast_mode}|{network_size}"
+    cache_file = CACHE_DIR / f"pipeline_{hashlib.md5(key.encode()).hexdigest()}.pkl"
+
+    if use_cache and cache_file.exists():
+        print(f"⚡ Loading pipeline from cache: {cache_file.name}")
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ Pipeline cache load failed: {e}. Rebuilding...")
+
+    network_data = build_network_pipeline(
+        place_name,
+        num_vehicles=num_vehicles,
+        use_cache=use_cache,
+        fast_mode=fast_mode,
+        network_size=network_size,
+    )
+
+    # Never persist the demo fallback, so the next run retries the download
+    if network_data["graph"].graph.get("demo"):
+        print("ℹ️ Demo network in use; pipeline not cached")
+    elif use_cache:
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump(network_data, f, protocol=PICKLE_PROTOCOL)
+            print(f"💾 Pipeline cached to {cache_file.name}")
+        except Exception as e:
+            print(f"⚠️ Pipeline caching failed: {e}")
+
+    return network_data
+
+
 # --------------------------------------------------
 # 9. UTILITY:  CLEAR CACHE
 # --------------------------------------------------
@@ -79,7 +79,7 @@ def build_qubo(vehicles, variable_map, congestion_weight=1.0):
         priority = v["priority_weight"]
 
         for r_idx, route in enumerate(v["candidate_routes"]):
-            edges = [(route[i], route[i + 1]) for i in range(len(route) - 1)]
+            edges = zip(route, route[1:])
             for edge in edges:
                 edge_usage[edge].append((vid, r_idx, priority))
 
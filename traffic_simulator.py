@@ -9,6 +9,8 @@ Author: Your Team
 
 import random
 
+import numpy as np
+
 
 # --------------------------------------------------
 # 1. CREATE VEHICLES (REGULAR + EMERGENCY)
@@ -89,7 +91,37 @@ def identify_congested_edges(G, congestion_threshold=7):
 
 
 # --------------------------------------------------
-# 4. BUILD TRAFFIC SCENARIO (PIPELINE)
+# 4. PACK CANDIDATE ROUTES INTO ARRAYS
+# --------------------------------------------------
+
+def pack_candidate_routes(vehicles):
+    """
+    Store each vehicle's candidate routes as one padded node-id array.
+
+    Rows are routes, right-padded with -1 to the longest route in the
+    batch, so downstream code can slice arr[i][arr[i] >= 0] instead of
+    walking Python lists. int64 because OSM node ids exceed 2**31.
+
+    Args:
+        vehicles (list of dicts)
+
+    Returns:
+        vehicles (list of dicts)
+    """
+    max_len = max((len(r) for v in vehicles for r in v["candidate_routes"]), default=0)
+
+    for vehicle in vehicles:
+        routes = vehicle["candidate_routes"]
+        arr = np.full((len(routes), max_len), -1, dtype=np.int64)
+        for i, route in enumerate(routes):
+            arr[i, :len(route)] = route
+        vehicle["candidate_routes_arr"] = arr
+
+    return vehicles
+
+
+# --------------------------------------------------
+# 5. BUILD TRAFFIC SCENARIO (PIPELINE)
 # --------------------------------------------------
 
 def build_traffic_scenario(network_data, emergency_ratio=0.2):
@@ -109,6 +141,7 @@ def build_traffic_scenario(network_data, emergency_ratio=0.2):
 
     vehicles = generate_vehicles(od_pairs, emergency_ratio)
     vehicles = assign_routes_to_vehicles(vehicles, routes)
+    vehicles = pack_candidate_routes(vehicles)
     congested_edges = identify_congested_edges(G)
 
     scenario = {
@@ -1,6 +1,51 @@
+import json
+import math
+import shutil
+import subprocess
+from pathlib import Path
+
 import folium
+import numpy as np
+from branca.element import MacroElement
+from folium.elements import JSCSSMixin
+from jinja2 import Template
+from shapely.geometry import LineString
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # numba is optional: kernels then run as plain Python
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+try:
+    import orjson
+except ImportError:  # orjson is optional: fall back to the stdlib encoder
+    orjson = None
+
+
+# Decimal places kept for map coordinates (1e-5 deg ~ 1 m)
+COORD_DECIMALS = 5
+
+EARTH_RADIUS_M = 6371000.0
+
+# Polyline styles for background traffic and the user's routes
+REGULAR_STYLE = {"color": "blue", "weight": 2, "opacity": 0.6}
+EMERGENCY_STYLE = {"color": "green", "weight": 4, "opacity": 0.9}
+ORIGINAL_STYLE = {"color": "red", "weight": 3, "opacity": 0.9, "dash_array": "6, 6"}
+OPTIMIZED_STYLE = {"color": "orange", "weight": 7, "opacity": 1.0}
+
+# Marker icon options (a folium.Icon binds to one Marker, so only the options are shared)
+START_ICON = {"color": "orange", "icon": "play"}
+END_ICON = {"color": "red", "icon": "stop"}
 
-import osmnx as ox   # ⭐ MUST BE HERE
+# Default Douglas-Peucker tolerance for background traffic (degrees, ~2 m)
+SIMPLIFY_TOLERANCE = 2e-5
+
+# User route polylines memoized per graph before that memo is reset
+USER_ROUTE_CACHE_SIZE = 64
 
 
 def visualize_traffic_map(
@@ -11,11 +56,18 @@ def visualize_traffic_map(
     regular_routes=None,
     user_start=None,
     user_end=None,
+    node_coords=None,
+    simplify_tolerance=SIMPLIFY_TOLERANCE,
+    viewport_bbox=None,
+    traffic_layers=None,
+    vector_grid=False,
+    map_center=None,
+    static_tiles=None,
 ):
     """Build a Folium map visualizing traffic and user routes.
 
-    The map is centered on the graph centroid by default (computed at runtime).
-    If `user_start` is provided it will be used as the map center instead.
+    The map is centered on `map_center` if given, else on `user_start`, else on
+    the graph's bounding-box midpoint.
 
     Args:
         G (networkx.Graph): Graph with node attributes 'x' (lon) and 'y' (lat).
@@ -25,82 +77,558 @@ def visualize_traffic_map(
         regular_routes (list[list], optional): list of node lists for regular traffic (BLUE).
         user_start (tuple, optional): (lat, lon) to place the start marker and prefer as center.
         user_end (tuple, optional): (lat, lon) to place the end marker.
+        node_coords (tuple, optional): ``(coords, node_idx)`` as returned by
+            `get_node_coords(G)`; looked up (and cached on the graph) when omitted.
+        simplify_tolerance (float, optional): Douglas-Peucker tolerance in degrees applied
+            to regular/emergency routes. The user's own routes are always drawn at full
+            fidelity. Use 0 or None to disable.
+        viewport_bbox (tuple, optional): (min_lat, min_lon, max_lat, max_lon); regular/emergency
+            routes entirely outside it are not drawn. No culling when omitted, since the
+            culled routes are absent from the HTML and would not reappear on pan/zoom.
+        traffic_layers (dict, optional): precomputed output of `build_traffic_layers`. When
+            given, it is drawn as-is and `regular_routes`/`emergency_routes` are ignored.
+        vector_grid (bool, optional): draw traffic layers through Leaflet.VectorGrid's slicer,
+            which tiles them client-side onto canvas (for very large route sets).
+        map_center (tuple, optional): (lat, lon) to center the map on; skips the
+            start/graph-center lookup entirely.
+        static_tiles (str, optional): URL of a file from `build_static_tiles`. Background
+            traffic is then loaded from it by the browser instead of being embedded, and
+            `regular_routes`/`emergency_routes`/`traffic_layers` are ignored.
 
     Returns:
         folium.Map: A Folium map object (freshly created; nothing is executed at module level).
     """
 
-    # Requirement: compute centroid here using the exact call
-    center = ox.graph_to_gdfs(G, nodes=True, edges=False).geometry.unary_union.centroid
-    map_center = (center.y, center.x)
-    if user_start:
-        map_center = user_start
-    m = folium.Map(location=map_center, zoom_start=13)
+    _check_graph(G)
+
+    if map_center is None:
+        map_center = _map_center(G, user_start)
+    m = folium.Map(location=map_center, zoom_start=13, prefer_canvas=True)
+
+    if node_coords is None:
+        node_coords = get_node_coords(G)
+
+    # Static traffic layers: pre-tiled file, precomputed once per scenario, or built here
+    if static_tiles is not None:
+        traffic_layers = {"regular": [], "emergency": []}
+    elif traffic_layers is None:
+        traffic_layers = build_traffic_layers(
+            G, regular_routes, emergency_routes,
+            node_coords=node_coords,
+            simplify_tolerance=simplify_tolerance,
+            viewport_bbox=viewport_bbox,
+        )
+
+    # One layer per non-empty route class so visibility can be toggled client-side
+    has_layers = False
+
+    # REGULAR ROUTES (BLUE) - one GeoJSON FeatureCollection for the whole class
+    if traffic_layers["regular"]:
+        regular_layer = folium.FeatureGroup(name="Regular Traffic").add_to(m)
+        _add_feature_collection(
+            traffic_layers["regular"], REGULAR_STYLE, regular_layer, vector_grid
+        )
+        has_layers = True
+
+    # EMERGENCY ROUTES (GREEN) - one GeoJSON FeatureCollection for the whole class
+    if traffic_layers["emergency"]:
+        emergency_layer = folium.FeatureGroup(name="Emergency Vehicles").add_to(m)
+        _add_feature_collection(
+            traffic_layers["emergency"], EMERGENCY_STYLE, emergency_layer, vector_grid
+        )
+        has_layers = True
+
+    if static_tiles is not None:
+        static_layer = folium.FeatureGroup(name="Traffic").add_to(m)
+        _StaticTrafficLayer(static_tiles).add_to(static_layer)
+        has_layers = True
+
+    if (user_start is not None or user_end is not None
+            or original_route or optimized_route):
+        user_layer = folium.FeatureGroup(name="Your Route").add_to(m)
+        has_layers = True
 
     # Start & End markers (only if coordinates supplied)
     if user_start is not None:
         folium.Marker(
             location=user_start,
             popup="Your Start",
-            icon=folium.Icon(color="orange", icon="play"),
-        ).add_to(m)
+            icon=folium.Icon(**START_ICON),
+        ).add_to(user_layer)
 
     if user_end is not None:
         folium.Marker(
             location=user_end,
             popup="Your Destination",
-            icon=folium.Icon(color="red", icon="stop"),
-        ).add_to(m)
-
-    # REGULAR ROUTES (BLUE)
-    if regular_routes:
-        for route in regular_routes:
-            if not route:
-                continue
-            coords = [_safe_node_latlon(G, n) for n in route]
-            folium.PolyLine(coords, color="blue", weight=2, opacity=0.6).add_to(m)
-
-    # EMERGENCY ROUTES (GREEN)
-    if emergency_routes:
-        for route in emergency_routes:
-            if not route:
-                continue
-            coords = [_safe_node_latlon(G, n) for n in route]
-            folium.PolyLine(coords, color="green", weight=4, opacity=0.9).add_to(m)
+            icon=folium.Icon(**END_ICON),
+        ).add_to(user_layer)
 
     # ORIGINAL USER ROUTE (RED dashed, weight=3)
     if original_route:
-        coords = [_safe_node_latlon(G, n) for n in original_route]
+        coords = _user_route_coords(G, original_route, node_coords)
+        length_km = route_length_m(original_route, node_coords) / 1000.0
         folium.PolyLine(
             coords,
-            color="red",
-            weight=3,
-            opacity=0.9,
-            dash_array="6, 6",
-            tooltip="Original (pre-optimization) Route",
-        ).add_to(m)
+            **ORIGINAL_STYLE,
+            tooltip=f"Original (pre-optimization) Route - {length_km:.2f} km",
+        ).add_to(user_layer)
 
     # OPTIMIZED USER ROUTE (ORANGE thick, weight=7, opacity=1.0)
     if optimized_route:
-        coords = [_safe_node_latlon(G, n) for n in optimized_route]
+        coords = _user_route_coords(G, optimized_route, node_coords)
+        length_km = route_length_m(optimized_route, node_coords) / 1000.0
         folium.PolyLine(
             coords,
-            color="orange",
-            weight=7,
-            opacity=1.0,
-            tooltip="Optimized Route",
-        ).add_to(m)
+            **OPTIMIZED_STYLE,
+            tooltip=f"Optimized Route - {length_km:.2f} km",
+        ).add_to(user_layer)
+
+    if has_layers:
+        folium.LayerControl(collapsed=False).add_to(m)
 
     return m
 
 
+def build_traffic_layers(
+    G,
+    regular_routes=None,
+    emergency_routes=None,
+    node_coords=None,
+    simplify_tolerance=SIMPLIFY_TOLERANCE,
+    viewport_bbox=None,
+):
+    """Precompute the static regular/emergency traffic layers as GeoJSON features.
+
+    The background traffic only changes when the scenario does, so callers can
+    build this once and pass it to `visualize_traffic_map(traffic_layers=...)`
+    instead of re-gathering and simplifying every route on each render.
+
+    Args:
+        G (networkx.Graph): Graph with node attributes 'x' (lon) and 'y' (lat).
+        regular_routes (list[list], optional): node lists for regular traffic.
+        emergency_routes (list[list], optional): node lists for emergency traffic.
+        node_coords (tuple, optional): ``(coords, node_idx)`` from `get_node_coords(G)`.
+        simplify_tolerance (float, optional): Douglas-Peucker tolerance in degrees.
+        viewport_bbox (tuple, optional): (min_lat, min_lon, max_lat, max_lon) to cull to;
+            no culling when omitted.
+
+    Returns:
+        dict: ``{"regular": [...], "emergency": [...]}`` lists of GeoJSON features.
+    """
+    # Drop empty routes once, up front; nothing downstream sees them
+    regular_routes = [r for r in (regular_routes or ()) if r]
+    emergency_routes = [r for r in (emergency_routes or ()) if r]
+    if not (regular_routes or emergency_routes):
+        return {"regular": [], "emergency": []}
+
+    if node_coords is None:
+        node_coords = get_node_coords(G)
+    args = (node_coords, simplify_tolerance, viewport_bbox)
+
+    return {
+        "regular": _traffic_features(regular_routes, *args),
+        "emergency": _traffic_features(emergency_routes, *args),
+    }
+
+
+def _map_center(G, user_start):
+    """Pick the map center: the user's start if given, else the graph center.
+
+    Never raises; a degenerate graph falls back to (0.0, 0.0) so a base map
+    can still be drawn.
+    """
+    if user_start:
+        return user_start
+    try:
+        return get_graph_center(G)
+    except Exception:
+        return (0.0, 0.0)
+
+
+def get_graph_center(G):
+    """Return the (lat, lon) bounding-box midpoint of the graph nodes, kept on ``G.graph``.
+
+    Used to center the map and as the geocoding fallback, where a bbox
+    midpoint is indistinguishable from the true centroid and costs two
+    reductions over the cached coords.
+    """
+    _check_graph(G)
+    center = G.graph.get("_center")
+    if center is None:
+        coords, _ = get_node_coords(G)
+        lo = coords.min(axis=0).astype(np.float64)
+        hi = coords.max(axis=0).astype(np.float64)
+        lat, lon = 0.5 * (lo + hi)
+        center = G.graph["_center"] = (float(lat), float(lon))
+    return center
+
+
+def build_node_coords(G, dtype=np.float32):
+    """Gather every node's (lat, lon) into one array for vectorized route lookups.
+
+    float32 (the default) keeps ~1 m precision, which is all the map can show,
+    at half the memory; pass ``dtype=np.float64`` for geometric work.
+
+    Returns:
+        tuple: ``(coords, node_idx)`` where `coords` is an (N, 2) array of
+        (lat, lon) rows and `node_idx` maps node id -> row index.
+    """
+    _check_graph(G)
+    node_list = list(G.nodes)
+    node_idx = {n: i for i, n in enumerate(node_list)}
+    coords = np.array([_safe_node_latlon(G, n) for n in node_list], dtype=dtype)
+    return coords, node_idx
+
+
+def get_node_coords(G):
+    """Return the graph's ``(coords, node_idx)`` arrays, built once and kept on ``G.graph``.
+
+    The per-node attribute fallbacks in `_safe_node_latlon` therefore run once
+    per graph rather than once per node per route per call.
+    """
+    _check_graph(G)
+    cache = G.graph.get("_xy_cache")
+    if cache is None:
+        cache = build_node_coords(G)
+        G.graph["_xy_cache"] = cache
+    return cache
+
+
+def _route_coords(route, node_coords):
+    """Return the [lat, lon] polyline for a route using the precomputed node coords.
+
+    Coordinates are widened to float64 and rounded to 5 decimals (~1 m), which
+    is all Leaflet can show and keeps each serialized float short.
+    """
+    return _route_array(route, node_coords).round(COORD_DECIMALS).tolist()
+
+
+def _user_route_coords(G, route, node_coords):
+    """Polyline for a user route, memoized on ``G.graph`` while drawn from its cached coords.
+
+    Caller-supplied coords that are not the graph's own cache are gathered
+    directly, so a polyline never mixes two coordinate sources.
+    """
+    if node_coords is not G.graph.get("_xy_cache"):
+        return _route_coords(route, node_coords)
+    cache = G.graph.setdefault("_route_coords_cache", {})
+    key = tuple(route)
+    coords = cache.get(key)
+    if coords is None:
+        if len(cache) >= USER_ROUTE_CACHE_SIZE:
+            cache.clear()
+        coords = cache[key] = _route_coords(route, node_coords)
+    return coords
+
+
+def _route_array(route, node_coords):
+    """Return a route's (lat, lon) rows as an (N, 2) float64 array."""
+    coords, node_idx = node_coords
+    return _gather_rows(coords, _route_index(route, node_idx))
+
+
+def build_static_tiles(
+    G,
+    regular_routes=None,
+    emergency_routes=None,
+    out="network.pmtiles",
+    simplify_tolerance=SIMPLIFY_TOLERANCE,
+):
+    """Pre-render background traffic once to a file for `visualize_traffic_map(static_tiles=...)`.
+
+    Writes a GeoJSON FeatureCollection (features tagged with ``kind``:
+    "regular"/"emergency") next to `out`. If `tippecanoe` is on PATH it is
+    then tiled into `out` as PMTiles (layer "traffic"); otherwise the GeoJSON
+    file itself is the output. Serve the file alongside the map HTML.
+
+    Returns:
+        str: path of the file to reference.
+    """
+    layers = build_traffic_layers(
+        G, regular_routes, emergency_routes, simplify_tolerance=simplify_tolerance
+    )
+    features = [
+        {**feature, "properties": {"kind": kind}}
+        for kind, kind_features in layers.items()
+        for feature in kind_features
+    ]
+
+    out = Path(out)
+    geojson_path = out.with_suffix(".geojson")
+    geojson_path.write_text(_dumps_json({"type": "FeatureCollection", "features": features}))
+
+    tippecanoe = shutil.which("tippecanoe")
+    if tippecanoe is None:
+        return str(geojson_path)
+
+    subprocess.run(
+        [tippecanoe, "-o", str(out), "-l", "traffic", "-zg",
+         "--drop-densest-as-needed", "--force", str(geojson_path)],
+        check=True,
+    )
+    return str(out)
+
+
+def _traffic_features(routes, node_coords, tolerance, bbox):
+    """GeoJSON LineString features for one class of non-empty traffic routes.
+
+    All routes of the class are gathered with one fancy-index and converted
+    with a single ``tolist()``; each route is then culled to `bbox` if given
+    (via per-route min/max reductions) and simplified. Coordinates are emitted in
+    GeoJSON [lon, lat] order.
+    """
+    if not routes:
+        return []
+
+    coords, node_idx = node_coords
+    lengths = np.fromiter((len(route) for route in routes), dtype=np.int64, count=len(routes))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    idx = np.fromiter(
+        (node_idx[n] for route in routes for n in route),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    class_arr = _gather_rows(coords, idx)
+
+    if bbox is None:
+        visible = np.ones(len(routes), dtype=bool)
+    else:
+        min_lat, min_lon, max_lat, max_lon = bbox
+        lo = np.minimum.reduceat(class_arr, starts, axis=0)
+        hi = np.maximum.reduceat(class_arr, starts, axis=0)
+        visible = ~((hi[:, 0] < min_lat) | (lo[:, 0] > max_lat)
+                    | (hi[:, 1] < min_lon) | (lo[:, 1] > max_lon))
+
+    lonlat = class_arr[:, ::-1].round(COORD_DECIMALS).tolist()
+    features = []
+    for start, length in zip(starts[visible].tolist(), lengths[visible].tolist()):
+        line = _simplify_line(lonlat[start:start + length], tolerance)
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": line},
+            "properties": {},
+        })
+    return features
+
+
+def _add_feature_collection(features, style, parent, vector_grid=False):
+    """Add features as a single GeoJSON (or VectorGrid) layer sharing one style."""
+    if not features:
+        return
+    collection = {"type": "FeatureCollection", "features": features}
+    if vector_grid:
+        _VectorGridSlicer(collection, style).add_to(parent)
+    else:
+        _GeoJsonCollection(collection, style).add_to(parent)
+
+
+class _GeoJsonCollection(MacroElement):
+    """Plain L.geoJSON layer over a FeatureCollection drawn with one shared style.
+
+    Unlike folium.GeoJson, the data is serialized once by `_dumps_json` and no
+    per-feature style map is built, since every feature shares `style`.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJSON(
+            {{ this.data_json }},
+            {style: {{ this.style|tojson }}}
+        ).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, style):
+        super().__init__()
+        self._name = "GeoJsonCollection"
+        self.data_json = _dumps_json(data)
+        self.style = style
+
+
+class _VectorGridSlicer(JSCSSMixin):
+    """Leaflet.VectorGrid slicer layer: tiles a GeoJSON FeatureCollection client-side.
+
+    All features are cut into vector tiles in the browser and painted per tile
+    on canvas, so the cost no longer scales with one path per route.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.vectorGrid.slicer(
+            {{ this.data_json }},
+            {
+                rendererFactory: L.canvas.tile,
+                vectorTileLayerStyles: {sliced: {{ this.style|tojson }}}
+            }
+        ).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    default_js = [
+        (
+            "leaflet.vectorgrid",
+            "https://unpkg.com/leaflet.vectorgrid@1.3.0/dist/Leaflet.VectorGrid.bundled.min.js",
+        )
+    ]
+
+    def __init__(self, data, style):
+        super().__init__()
+        self._name = "VectorGridSlicer"
+        self.data_json = _dumps_json(data)
+        self.style = style
+
+
+class _StaticTrafficLayer(JSCSSMixin):
+    """Background traffic read by the browser from a file written by `build_static_tiles`.
+
+    PMTiles are drawn with protomaps-leaflet 1.24 (whose options are
+    snake_case, e.g. ``paint_rules``; 2.x renamed them); a GeoJSON file is
+    fetched and drawn with L.geoJSON. Either way nothing is embedded in the page.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        {% if this.is_pmtiles %}
+        var {{ this.get_name() }} = protomapsL.leafletLayer({
+            url: {{ this.url|tojson }},
+            label_rules: [],
+            paint_rules: [
+                {% for kind, style in this.styles.items() %}
+                {
+                    dataLayer: "traffic",
+                    symbolizer: new protomapsL.LineSymbolizer({
+                        color: {{ style.color|tojson }},
+                        width: {{ style.weight }},
+                        opacity: {{ style.opacity }}
+                    }),
+                    filter: function(z, f) { return f.props.kind === {{ kind|tojson }}; }
+                },
+                {% endfor %}
+            ]
+        }).addTo({{ this._parent.get_name() }});
+        {% else %}
+        var {{ this.get_name() }} = L.layerGroup().addTo({{ this._parent.get_name() }});
+        fetch({{ this.url|tojson }})
+            .then(function(response) { return response.json(); })
+            .then(function(data) {
+                var styles = {{ this.styles|tojson }};
+                L.geoJSON(data, {
+                    style: function(f) { return styles[f.properties.kind]; }
+                }).addTo({{ this.get_name() }});
+            });
+        {% endif %}
+        {% endmacro %}
+    """)
+
+    def __init__(self, url):
+        super().__init__()
+        self._name = "StaticTrafficLayer"
+        self.url = url
+        self.is_pmtiles = str(url).endswith(".pmtiles")
+        self.styles = {"regular": REGULAR_STYLE, "emergency": EMERGENCY_STYLE}
+        self.default_js = [
+            (
+                "protomaps-leaflet",
+                "https://unpkg.com/protomaps-leaflet@1.24.0/dist/protomaps-leaflet.min.js",
+            )
+        ] if self.is_pmtiles else []
+
+
+def _dumps_json(data):
+    """Serialize to a JSON string safe to inline in a <script> block.
+
+    Uses orjson (vectorized C, NumPy-aware) when installed, else `json`.
+    """
+    if orjson is not None:
+        text = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    else:
+        text = json.dumps(data, separators=(",", ":"))
+    return text.replace("</", "<\\/")
+
+
+def _simplify_line(coords, tolerance):
+    """Drop near-collinear vertices from a polyline with Douglas-Peucker."""
+    if not tolerance or len(coords) < 3:
+        return coords
+    return LineString(coords).simplify(tolerance, preserve_topology=False).coords[:]
+
+
+def _gather_rows(coords, idx):
+    """Return ``coords[idx]`` as a new float64 (N, 2) array.
+
+    With numba the gather and the float32 -> float64 widening happen in one
+    compiled pass; otherwise NumPy fancy indexing does the same in C.
+    """
+    if not HAS_NUMBA:
+        return coords[idx].astype(np.float64)
+    out = np.empty((idx.shape[0], 2), dtype=np.float64)
+    _gather_rows_kernel(idx, coords, out)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _gather_rows_kernel(idx, coords, out):
+    """Copy the (lat, lon) rows selected by `idx` from `coords` into `out`."""
+    for i in range(idx.shape[0]):
+        out[i, 0] = coords[idx[i], 0]
+        out[i, 1] = coords[idx[i], 1]
+
+
+def _route_index(route, node_idx):
+    """Translate a route's node ids into an int64 row-index array in one pass."""
+    return np.fromiter((node_idx[n] for n in route), dtype=np.int64, count=len(route))
+
+
+def route_length_m(route, node_coords):
+    """Great-circle length of a route in meters.
+
+    Args:
+        route (list): node list.
+        node_coords (tuple): ``(coords, node_idx)`` from `get_node_coords(G)`.
+    """
+    coords, node_idx = node_coords
+    latlon = np.radians(_gather_rows(coords, _route_index(route, node_idx)))
+    return _haversine_path_m(
+        np.ascontiguousarray(latlon[:, 0]), np.ascontiguousarray(latlon[:, 1])
+    )
+
+
+@njit(cache=True, fastmath=True)
+def _haversine_path_m(lats, lons):
+    """Sum of haversine distances along consecutive (lat, lon) points in radians."""
+    total = 0.0
+    for i in range(lats.size - 1):
+        dlat = lats[i + 1] - lats[i]
+        dlon = lons[i + 1] - lons[i]
+        a = (math.sin(dlat / 2) ** 2
+             + math.cos(lats[i]) * math.cos(lats[i + 1]) * math.sin(dlon / 2) ** 2)
+        total += 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+    return total
+
+
+def _check_graph(G):
+    """Raise TypeError unless `G` looks like a NetworkX graph."""
+    if not hasattr(G, "nodes"):
+        raise TypeError(f"G must be a NetworkX graph, got {type(G).__name__}")
+
+
 def _safe_node_latlon(G, node):
     """Return (lat, lon) for a node in G, with safe fallbacks.
 
-    This helper avoids raising if expected attributes are missing.
+    This helper avoids raising if expected attributes are missing; `G` itself
+    is validated once by its only caller, `build_node_coords`, not per node.
     Accepts typical OSMnx attributes 'y'/'x' or alternative 'lat'/'lon'.
     """
-    data = G.nodes.get(node, {}) if hasattr(G, "nodes") else {}
+    # Fast path: OSMnx nodes always carry 'y'/'x'
+    try:
+        data = G.nodes[node]
+        lat, lon = data["y"], data["x"]
+        if lat is not None and lon is not None:
+            return (lat, lon)
+    except (KeyError, TypeError):
+        pass
+
+    data = G.nodes.get(node, {})
     lat = data.get("y") if data is not None else None
     lon = data.get("x") if data is not None else None
 